@@ -2,11 +2,22 @@
 import sys
 import os
 import json
+import gzip
+import time
+import hashlib
+import threading
 import warnings
 import logging
+import orjson
 import requests
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
 from flask_cors import CORS
 
 from mcq.crew import Mcq
@@ -22,22 +33,140 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 DJANGO_API_BASE_URL = "http://65.0.249.245:8000"
 OCR_DATA_ENDPOINT = f"{DJANGO_API_BASE_URL}/ocr/"
 COMPARE_TEXT_ENDPOINT = f"{DJANGO_API_BASE_URL}/compare-text/"
+COMPARE_TEXT_UPSERT_ENDPOINT = f"{DJANGO_API_BASE_URL}/compare-text/upsert/"
+
+# Upper bound on scripts processed in parallel by a single POST /run request
+MAX_CONCURRENT_SCRIPTS = int(os.environ.get('MCQ_MAX_CONCURRENT_SCRIPTS', 4))
+# Upper bound on script_ids accepted by a single POST /run request
+MAX_SCRIPTS_PER_REQUEST = int(os.environ.get('MCQ_MAX_SCRIPTS_PER_REQUEST', 20))
+
+# Gzip JSON request bodies sent to Django; enable once the server decodes Content-Encoding: gzip
+GZIP_REQUEST_BODIES = os.environ.get('MCQ_GZIP_REQUEST_BODIES', '').lower() in ('1', 'true', 'yes')
+
+# Bounded (connect, read) timeout so a hung Django socket can't pin a worker indefinitely
+HTTP_TIMEOUT = (5, 60)
+
+# Shared HTTP session so every call to the Django API reuses pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update({'Content-Type': 'application/json'})
+
+# Larger per-host pool so concurrent requests reuse warm sockets; retry transient gateway errors.
+# raise_on_status=False hands the final response back so raise_for_status() still reports it.
+# read=False: a read timeout surfaces once as ReadTimeout instead of multiplying HTTP_TIMEOUT by the retries.
+HTTP_RETRY = Retry(total=3, read=False, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+HTTP_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32, pool_block=False, max_retries=HTTP_RETRY)
+SESSION.mount('http://', HTTP_ADAPTER)
+SESSION.mount('https://', HTTP_ADAPTER)
+
+# Parsed OCR responses cached per script_id; every fetch revalidates with the server
+OCR_CACHE_MAXSIZE = 1024
+_ocr_cache = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
+# When the Django API reports the upsert endpoint as missing, use lookup + save/update
+# until this many seconds have passed, then probe the endpoint again
+UPSERT_REPROBE_INTERVAL = int(os.environ.get('MCQ_UPSERT_REPROBE_INTERVAL', 300))
+_upsert_unavailable_until = 0.0
+_upsert_lock = threading.Lock()
+
+# Opt-in on-disk cache of crew output keyed by the script's page OCR and the crew config;
+# set MCQ_CACHE_DIR (e.g. /tmp/mcq_cache) to enable. Entries expire after MCQ_CACHE_TTL seconds.
+MCQ_CACHE_DIR = os.environ.get('MCQ_CACHE_DIR', '')
+MCQ_CACHE_TTL = int(os.environ.get('MCQ_CACHE_TTL', 24 * 60 * 60))
+CREW_CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config')
+
+_page_number_and_ocr = itemgetter('page_number', 'ocr_json')
 
 # -------------------------------
 # 🔍 Helper Functions
 # -------------------------------
+def _json_default(obj):
+    """
+    Encode objects orjson can't handle natively, such as CrewAI's pydantic usage metrics
+    """
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    return str(obj)
+
+def dump_json(payload):
+    """
+    Serialize a payload to JSON bytes with orjson
+    """
+    return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+def encode_request_body(data):
+    """
+    Encode a JSON request body for the Django API, returning the body and any extra headers
+    """
+    body = dump_json(data)
+    if GZIP_REQUEST_BODIES:
+        return gzip.compress(body, compresslevel=1), {'Content-Encoding': 'gzip'}
+    return body, {}
+
+def json_response(payload, status=200):
+    """
+    Build a Flask JSON response without going through Flask's Python-level encoder
+    """
+    return Response(dump_json(payload), status=status, mimetype='application/json')
+
+def _get_cached_ocr(script_id):
+    with _ocr_cache_lock:
+        entry = _ocr_cache.get(script_id)
+        if entry is not None:
+            _ocr_cache.move_to_end(script_id)
+        return entry
+
+def _store_cached_ocr(script_id, data, etag, fingerprint):
+    with _ocr_cache_lock:
+        _ocr_cache[script_id] = {
+            'data': data,
+            'etag': etag,
+            'fingerprint': fingerprint
+        }
+        _ocr_cache.move_to_end(script_id)
+        while len(_ocr_cache) > OCR_CACHE_MAXSIZE:
+            _ocr_cache.popitem(last=False)
+
 def fetch_ocr_data(script_id=None):
     """
-    Fetch OCR data from the Django API
+    Fetch OCR data from the Django API.
+    Every call asks the server; for a script_id the parsed result is reused when the server
+    answers 304 to If-None-Match or returns a body with an unchanged fingerprint.
     """
     try:
         params = {}
+        headers = {}
+        entry = None
         if script_id:
             params['script_id'] = script_id
+            entry = _get_cached_ocr(script_id)
+        
+        if entry is not None and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
         
-        response = requests.get(OCR_DATA_ENDPOINT, params=params)
+        response = SESSION.get(OCR_DATA_ENDPOINT, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+        if entry is not None and response.status_code == 304:
+            logger.info("Reusing cached OCR data for script ID: %s", script_id)
+            return list(entry['data'])
         response.raise_for_status()
-        return response.json()
+        
+        if not script_id:
+            return orjson.loads(response.content)
+        
+        # Unchanged body (server without ETag support): keep the already-parsed data
+        fingerprint = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        if entry is not None and entry['fingerprint'] == fingerprint:
+            data = entry['data']
+        else:
+            data = orjson.loads(response.content)
+        # Empty results aren't cached: the OCR upload may simply not have arrived yet
+        if data:
+            _store_cached_ocr(script_id, data, response.headers.get('ETag'), fingerprint)
+        return list(data)
+    except requests.exceptions.Timeout:
+        raise Exception(f"Timed out fetching OCR data from API at {DJANGO_API_BASE_URL}")
     except requests.exceptions.ConnectionError:
         raise Exception(f"Failed to connect to API at {DJANGO_API_BASE_URL}. Make sure the Django server is running.")
     except requests.exceptions.HTTPError as e:
@@ -47,66 +176,115 @@ def fetch_ocr_data(script_id=None):
     except json.JSONDecodeError:
         raise Exception("Invalid JSON response from API")
 
+# Attributes used to memoize extracted token usage and to_dict() on a crew output object
+TOKEN_USAGE_ATTR = '__extracted_tokens__'
+CREW_DICT_ATTR = '__cached_dict__'
+_MISSING = object()
+
+# Token counts summed across per-task usage when a crew output has no overall total
+TOKEN_COUNT_KEYS = ('total_tokens', 'prompt_tokens', 'completion_tokens')
+
+def _memoize_on(obj, attr, value):
+    try:
+        setattr(obj, attr, value)
+    except (AttributeError, TypeError, ValueError):
+        # Objects without an instance __dict__ (e.g. plain strings) just aren't cached
+        pass
+    return value
+
+def crew_output_dict(crew_output):
+    """
+    Return crew_output.to_dict(), computed at most once per output object
+    """
+    cached = getattr(crew_output, CREW_DICT_ATTR, None)
+    if cached is not None:
+        return cached
+    return _memoize_on(crew_output, CREW_DICT_ATTR, crew_output.to_dict())
+
 def extract_token_usage(crew_output):
     """
-    Extract token usage information from CrewAI output
+    Extract token usage information from CrewAI output.
+    The result is cached on the output object so later calls skip the lookup.
+    """
+    cached = getattr(crew_output, TOKEN_USAGE_ATTR, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    
+    return _memoize_on(crew_output, TOKEN_USAGE_ATTR, _extract_token_usage(crew_output))
+
+def _usage_from_attributes(output):
+    """
+    Read token usage straight off a CrewAI output object
+    """
+    return getattr(output, 'token_usage', None) or getattr(output, 'usage_metrics', None)
+
+# Token usage extractors for known CrewAI output classes, keyed on class name so
+# the common case is a single dict lookup instead of the hasattr cascade below
+TOKEN_USAGE_EXTRACTORS = {
+    'CrewOutput': _usage_from_attributes,
+    'TaskOutput': _usage_from_attributes,
+}
+
+def _extract_token_usage_fallback(crew_output):
+    """
+    Probe the attributes CrewAI has used over time to store token usage
+    """
+    # Different ways CrewAI might store token usage
+    token_usage = None
+    
+    # Method 1: Direct token_usage attribute
+    if hasattr(crew_output, 'token_usage'):
+        token_usage = crew_output.token_usage
+        logger.info("🔥 Found token_usage attribute: %s", token_usage)
+    
+    # Method 2: Usage metrics
+    elif hasattr(crew_output, 'usage_metrics'):
+        token_usage = crew_output.usage_metrics
+        logger.info("🔥 Found usage_metrics attribute: %s", token_usage)
+    
+    # Method 3: Check if it's in the result dictionary
+    elif hasattr(crew_output, 'to_dict'):
+        result_dict = crew_output_dict(crew_output)
+        if 'token_usage' in result_dict:
+            token_usage = result_dict['token_usage']
+            logger.info("🔥 Found token_usage in to_dict: %s", token_usage)
+        elif 'usage_metrics' in result_dict:
+            token_usage = result_dict['usage_metrics']
+            logger.info("🔥 Found usage_metrics in to_dict: %s", token_usage)
+    
+    # Method 4: Check tasks for individual token usage
+    elif hasattr(crew_output, 'tasks_output'):
+        totals = Counter()
+        for task_output in crew_output.tasks_output:
+            task_tokens = getattr(task_output, 'token_usage', None)
+            if isinstance(task_tokens, dict):
+                totals.update({key: task_tokens.get(key) or 0 for key in TOKEN_COUNT_KEYS})
+        if totals['total_tokens'] > 0:
+            token_usage = dict(totals)
+            logger.info("🔥 Calculated token usage from tasks: %s", token_usage)
+    
+    # Method 5: Check if crew has usage tracking
+    elif hasattr(crew_output, 'crew') and hasattr(crew_output.crew, 'usage_metrics'):
+        token_usage = crew_output.crew.usage_metrics
+        logger.info("🔥 Found usage_metrics in crew: %s", token_usage)
+    
+    # Method 6: Check for _usage or usage attributes
+    elif hasattr(crew_output, '_usage'):
+        token_usage = crew_output._usage
+        logger.info("🔥 Found _usage attribute: %s", token_usage)
+    elif hasattr(crew_output, 'usage'):
+        token_usage = crew_output.usage
+        logger.info("🔥 Found usage attribute: %s", token_usage)
+    
+    return token_usage
+
+def _extract_token_usage(crew_output):
+    """
+    Find token usage information on a CrewAI output and log it
     """
     try:
-        # Different ways CrewAI might store token usage
-        token_usage = None
-        
-        # Method 1: Direct token_usage attribute
-        if hasattr(crew_output, 'token_usage'):
-            token_usage = crew_output.token_usage
-            logger.info(f"🔥 Found token_usage attribute: {token_usage}")
-        
-        # Method 2: Usage metrics
-        elif hasattr(crew_output, 'usage_metrics'):
-            token_usage = crew_output.usage_metrics
-            logger.info(f"🔥 Found usage_metrics attribute: {token_usage}")
-        
-        # Method 3: Check if it's in the result dictionary
-        elif hasattr(crew_output, 'to_dict'):
-            result_dict = crew_output.to_dict()
-            if 'token_usage' in result_dict:
-                token_usage = result_dict['token_usage']
-                logger.info(f"🔥 Found token_usage in to_dict: {token_usage}")
-            elif 'usage_metrics' in result_dict:
-                token_usage = result_dict['usage_metrics']
-                logger.info(f"🔥 Found usage_metrics in to_dict: {token_usage}")
-        
-        # Method 4: Check tasks for individual token usage
-        elif hasattr(crew_output, 'tasks_output'):
-            total_tokens = 0
-            prompt_tokens = 0
-            completion_tokens = 0
-            for task_output in crew_output.tasks_output:
-                if hasattr(task_output, 'token_usage'):
-                    task_tokens = task_output.token_usage
-                    if isinstance(task_tokens, dict):
-                        total_tokens += task_tokens.get('total_tokens', 0)
-                        prompt_tokens += task_tokens.get('prompt_tokens', 0)
-                        completion_tokens += task_tokens.get('completion_tokens', 0)
-            if total_tokens > 0:
-                token_usage = {
-                    'total_tokens': total_tokens,
-                    'prompt_tokens': prompt_tokens,
-                    'completion_tokens': completion_tokens
-                }
-                logger.info(f"🔥 Calculated token usage from tasks: {token_usage}")
-        
-        # Method 5: Check if crew has usage tracking
-        elif hasattr(crew_output, 'crew') and hasattr(crew_output.crew, 'usage_metrics'):
-            token_usage = crew_output.crew.usage_metrics
-            logger.info(f"🔥 Found usage_metrics in crew: {token_usage}")
-        
-        # Method 6: Check for _usage or usage attributes
-        elif hasattr(crew_output, '_usage'):
-            token_usage = crew_output._usage
-            logger.info(f"🔥 Found _usage attribute: {token_usage}")
-        elif hasattr(crew_output, 'usage'):
-            token_usage = crew_output.usage
-            logger.info(f"🔥 Found usage attribute: {token_usage}")
+        extractor = TOKEN_USAGE_EXTRACTORS.get(type(crew_output).__name__, _extract_token_usage_fallback)
+        token_usage = extractor(crew_output)
         
         # Log detailed token usage if found
         if token_usage:
@@ -114,16 +292,16 @@ def extract_token_usage(crew_output):
                 total_tokens = token_usage.get('total_tokens', 0)
                 prompt_tokens = token_usage.get('prompt_tokens', 0)
                 completion_tokens = token_usage.get('completion_tokens', 0)
-                logger.info(f"📊 TOKEN BREAKDOWN - Total: {total_tokens}, Prompt: {prompt_tokens}, Completion: {completion_tokens}")
+                logger.info("📊 TOKEN BREAKDOWN - Total: %s, Prompt: %s, Completion: %s", total_tokens, prompt_tokens, completion_tokens)
             else:
-                logger.info(f"📊 TOTAL TOKENS USED: {token_usage}")
+                logger.info("📊 TOTAL TOKENS USED: %s", token_usage)
         else:
             logger.warning("⚠️ No token usage information found in CrewAI output")
         
         return token_usage
         
     except Exception as e:
-        logger.warning(f"Could not extract token usage: {e}")
+        logger.warning("Could not extract token usage: %s", e)
         return None
 
 def serialize_crew_output(crew_output):
@@ -131,84 +309,76 @@ def serialize_crew_output(crew_output):
     Convert CrewOutput object to JSON-serializable format
     """
     try:
-        # Extract and log token usage information
-        token_usage = extract_token_usage(crew_output)
-        
-        if hasattr(crew_output, 'raw') and crew_output.raw:
-            return crew_output.raw
-        elif hasattr(crew_output, '__str__'):
-            return str(crew_output)
-        elif hasattr(crew_output, 'result'):
-            return crew_output.result
-        elif hasattr(crew_output, 'to_dict'):
-            return crew_output.to_dict()
-        else:
-            return str(crew_output)
+        for attr in ('raw', 'result'):
+            value = getattr(crew_output, attr, None)
+            if value:
+                return value
+        if hasattr(crew_output, 'to_dict'):
+            return crew_output_dict(crew_output)
+        return str(crew_output)
     except Exception as e:
-        logger.warning(f"Could not serialize CrewOutput properly: {e}")
+        logger.warning("Could not serialize CrewOutput properly: %s", e)
         return str(crew_output)
 
-def save_mcq_result(script_id, mcq_result, vlmdesc=None, restructured=None, final_corrected_text=""):
+def save_mcq_result(script_id, mcq_payload, vlmdesc=None, restructured=None, final_corrected_text=""):
     """
-    Save MCQ processing result to the database via CompareText API
+    Save MCQ processing result (already serialized with serialize_crew_output) to the database via CompareText API
     """
     try:
-        serialized_mcq_result = serialize_crew_output(mcq_result)
-        
         data = {
             'script_id': script_id,
             'vlmdesc': vlmdesc or {},
             'restructured': restructured or {},
             'final_corrected_text': final_corrected_text,
-            'mcq': serialized_mcq_result
+            'mcq': mcq_payload
         }
         
-        logger.info(f"Saving MCQ result to database for script {script_id}...")
+        logger.info("Saving MCQ result to database for script %s...", script_id)
         
-        response = requests.post(COMPARE_TEXT_ENDPOINT, 
-                               json=data,
-                               headers={'Content-Type': 'application/json'})
+        body, headers = encode_request_body(data)
+        response = SESSION.post(COMPARE_TEXT_ENDPOINT, data=body, headers=headers, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
-        result = response.json()
-        logger.info(f"Successfully saved to database. CompareText ID: {result.get('compare_text_id')}")
+        result = orjson.loads(response.content)
+        logger.info("Successfully saved to database. CompareText ID: %s", result.get('compare_text_id'))
         return result
         
+    except requests.exceptions.Timeout:
+        raise Exception(f"Timed out saving MCQ result to API at {DJANGO_API_BASE_URL}")
     except requests.exceptions.ConnectionError:
         raise Exception(f"Failed to connect to API at {DJANGO_API_BASE_URL}. Make sure the Django server is running.")
     except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP error when saving to database: {e}")
+        logger.error("HTTP error when saving to database: %s", e)
         raise Exception(f"Failed to save MCQ result to database: {e}")
     except requests.exceptions.RequestException as e:
         raise Exception(f"Request error when saving to database: {e}")
     except json.JSONDecodeError:
         raise Exception("Invalid JSON response when saving to database")
 
-def update_existing_mcq_result(compare_text_id, mcq_result):
+def update_existing_mcq_result(compare_text_id, mcq_payload):
     """
-    Update existing CompareText record with MCQ result
+    Update existing CompareText record with MCQ result (already serialized with serialize_crew_output)
     """
     try:
-        serialized_mcq_result = serialize_crew_output(mcq_result)
-        
         data = {
             'compare_text_id': compare_text_id,
-            'mcq': serialized_mcq_result
+            'mcq': mcq_payload
         }
         
-        logger.info(f"Updating existing CompareText record {compare_text_id} with MCQ result...")
+        logger.info("Updating existing CompareText record %s with MCQ result...", compare_text_id)
         
-        response = requests.put(COMPARE_TEXT_ENDPOINT, 
-                              json=data,
-                              headers={'Content-Type': 'application/json'})
+        body, headers = encode_request_body(data)
+        response = SESSION.put(COMPARE_TEXT_ENDPOINT, data=body, headers=headers, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
-        result = response.json()
-        logger.info(f"Successfully updated CompareText record {compare_text_id}")
+        result = orjson.loads(response.content)
+        logger.info("Successfully updated CompareText record %s", compare_text_id)
         return result
         
+    except requests.exceptions.Timeout:
+        raise Exception(f"Timed out updating MCQ result at API {DJANGO_API_BASE_URL}")
     except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP error when updating database: {e}")
+        logger.error("HTTP error when updating database: %s", e)
         raise Exception(f"Failed to update MCQ result in database: {e}")
     except Exception as e:
         raise Exception(f"Error updating MCQ result: {e}")
@@ -219,10 +389,10 @@ def check_existing_compare_text(script_id):
     """
     try:
         params = {'script_id': script_id}
-        response = requests.get(COMPARE_TEXT_ENDPOINT, params=params)
+        response = SESSION.get(COMPARE_TEXT_ENDPOINT, params=params, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         if data and len(data) > 0:
             return data[0]
         return None
@@ -230,26 +400,181 @@ def check_existing_compare_text(script_id):
     except requests.exceptions.HTTPError:
         return None
     except Exception as e:
-        logger.warning(f"Could not check for existing CompareText records: {e}")
+        logger.warning("Could not check for existing CompareText records: %s", e)
         return None
 
-def process_script_pages(script_data, script_id):
+def _upsert_endpoint_missing(response):
     """
-    Process all pages of a script together through the MCQ crew
+    Tell a server without the upsert route apart from errors returned by the upsert view itself
     """
-    all_pages_ocr = []
+    if response.status_code == 405:
+        return True
+    # Django's not-found page for an unknown route is HTML; the view's own 404s are JSON
+    content_type = response.headers.get('Content-Type', '')
+    return response.status_code == 404 and 'application/json' not in content_type
+
+def upsert_mcq_result(script_id, mcq_payload, vlmdesc=None, restructured=None, final_corrected_text=""):
+    """
+    Create or update the script's CompareText record with the MCQ result in a single call.
+    The API gets-or-creates by script_id; vlmdesc, restructured and final_corrected_text only
+    apply when a record is created. Falls back to lookup + save/update on servers without it.
+    """
+    global _upsert_unavailable_until
     
-    for record in script_data:
-        ocr_json = record.get('ocr_json')
-        if not ocr_json:
-            logger.warning(f"No ocr_json found for page {record.get('page_number', 'Unknown')}")
-            continue
-        
-        page_data = {
-            'page_number': record.get('page_number'),
-            'ocr_json': ocr_json
+    if time.monotonic() >= _upsert_unavailable_until:
+        data = {
+            'script_id': script_id,
+            'vlmdesc': vlmdesc or {},
+            'restructured': restructured or {},
+            'final_corrected_text': final_corrected_text,
+            'mcq': mcq_payload
         }
-        all_pages_ocr.append(page_data)
+        
+        try:
+            logger.info("Upserting MCQ result to database for script %s...", script_id)
+            
+            body, headers = encode_request_body(data)
+            response = SESSION.post(COMPARE_TEXT_UPSERT_ENDPOINT, data=body, headers=headers, timeout=HTTP_TIMEOUT)
+            if _upsert_endpoint_missing(response):
+                logger.warning("CompareText upsert endpoint unavailable (status %s), using lookup + save/update", response.status_code)
+                with _upsert_lock:
+                    _upsert_unavailable_until = time.monotonic() + UPSERT_REPROBE_INTERVAL
+            else:
+                response.raise_for_status()
+                
+                result = orjson.loads(response.content)
+                logger.info("Successfully upserted CompareText record %s", result.get('compare_text_id'))
+                return result
+            
+        except requests.exceptions.Timeout:
+            raise Exception(f"Timed out upserting MCQ result to API at {DJANGO_API_BASE_URL}")
+        except requests.exceptions.ConnectionError:
+            raise Exception(f"Failed to connect to API at {DJANGO_API_BASE_URL}. Make sure the Django server is running.")
+        except requests.exceptions.HTTPError as e:
+            logger.error("HTTP error when upserting to database: %s", e)
+            raise Exception(f"Failed to upsert MCQ result to database: {e}")
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request error when upserting to database: {e}")
+        except json.JSONDecodeError:
+            raise Exception("Invalid JSON response when upserting to database")
+    
+    existing_record = check_existing_compare_text(script_id)
+    if existing_record:
+        return update_existing_mcq_result(existing_record['compare_text_id'], mcq_payload)
+    return save_mcq_result(
+        script_id=script_id,
+        mcq_payload=mcq_payload,
+        vlmdesc=vlmdesc,
+        restructured=restructured,
+        final_corrected_text=final_corrected_text
+    )
+
+@lru_cache(maxsize=1)
+def _crew_config_fingerprint():
+    """
+    Hash the crew's YAML config and model selection so cached results don't outlive config changes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name in ('agents.yaml', 'tasks.yaml'):
+        with open(os.path.join(CREW_CONFIG_DIR, name), 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    for var in ('MODEL', 'OPENAI_MODEL_NAME'):
+        digest.update(os.environ.get(var, '').encode())
+        digest.update(b'\0')
+    return digest.digest()
+
+def mcq_cache_key(all_pages_ocr):
+    """
+    Hash the crew config and the ordered page entries ({'page_number', 'ocr_json'}) passed to the crew
+    """
+    digest = hashlib.blake2b(_crew_config_fingerprint(), digest_size=16)
+    for page in all_pages_ocr:
+        page_json = orjson.dumps(page, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        digest.update(hashlib.blake2b(page_json, digest_size=16).digest())
+    return digest.hexdigest()
+
+def load_cached_mcq_result(cache_key):
+    """
+    Return the unexpired cache entry ({'mcq_result', 'token_usage'}) stored under cache_key, or None
+    """
+    if not MCQ_CACHE_DIR:
+        return None
+    path = os.path.join(MCQ_CACHE_DIR, f"{cache_key}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > MCQ_CACHE_TTL:
+            os.remove(path)
+            return None
+        with open(path, 'rb') as f:
+            entry = orjson.loads(f.read())
+        return entry if 'mcq_result' in entry else None
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Could not read MCQ cache entry %s: %s", cache_key, e)
+        return None
+
+def _prune_mcq_cache():
+    """
+    Drop expired entries (and leftover temp files) so the cache directory stays bounded
+    """
+    cutoff = time.time() - MCQ_CACHE_TTL
+    for entry in os.scandir(MCQ_CACHE_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def store_cached_mcq_result(cache_key, mcq_result, token_usage):
+    """
+    Persist serialized crew output and the token usage spent producing it under cache_key
+    """
+    if not MCQ_CACHE_DIR:
+        return
+    try:
+        os.makedirs(MCQ_CACHE_DIR, exist_ok=True)
+        _prune_mcq_cache()
+        path = os.path.join(MCQ_CACHE_DIR, f"{cache_key}.json")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(dump_json({'mcq_result': mcq_result, 'token_usage': token_usage}))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning("Could not write MCQ cache entry %s: %s", cache_key, e)
+
+@lru_cache(maxsize=1)
+def _base_mcq_crew():
+    """
+    Build the MCQ crew once; its YAML agent and task config is static across requests
+    """
+    return Mcq().crew()
+
+def build_mcq_crew():
+    """
+    Return a private copy of the MCQ crew so concurrent runs don't share task state
+    """
+    return _base_mcq_crew().copy()
+
+def process_script_pages(script_data, script_id, crew=None, refresh=False):
+    """
+    Process all pages of a script together through the MCQ crew.
+    crew is a crew from build_mcq_crew() prepared by the caller; one is built if omitted.
+    refresh bypasses the crew output cache and overwrites its entry.
+    """
+    pages = [
+        _page_number_and_ocr(record) if 'page_number' in record and 'ocr_json' in record
+        else (record.get('page_number'), record.get('ocr_json'))
+        for record in script_data
+    ]
+    all_pages_ocr = [
+        {'page_number': page_number, 'ocr_json': ocr_json}
+        for page_number, ocr_json in pages if ocr_json
+    ]
+    
+    missing_pages = [page_number for page_number, ocr_json in pages if not ocr_json]
+    if missing_pages:
+        logger.warning("No ocr_json found for pages: %s", missing_pages)
     
     if not all_pages_ocr:
         raise Exception("No valid OCR data found in any page")
@@ -259,57 +584,74 @@ def process_script_pages(script_data, script_id):
     }
     
     try:
-        logger.info("🚀 Processing script pages through MCQ crew...")
-        result = Mcq().crew().kickoff(inputs=inputs)
-        
-        logger.info(f"MCQ crew result type: {type(result)}")
+        # Identical page sets (re-runs, shared boilerplate scripts) reuse the earlier crew output
+        cache_key = mcq_cache_key(all_pages_ocr)
+        cached_entry = None if refresh else load_cached_mcq_result(cache_key)
+        cache_hit = cached_entry is not None
+        # Tokens originally spent producing a cached result; kept apart so usage isn't counted twice
+        cached_token_usage = None
+        if cache_hit:
+            logger.info("♻️ Reusing cached MCQ result for script %s (%s)", script_id, cache_key)
+            mcq_payload = cached_entry['mcq_result']
+            token_usage_info = None
+            cached_token_usage = cached_entry.get('token_usage')
+        else:
+            logger.info("🚀 Processing script pages through MCQ crew...")
+            result = (crew or build_mcq_crew()).kickoff(inputs=inputs)
+            
+            logger.info("MCQ crew result type: %s", type(result))
+            
+            # Serialize once; the same payload is cached, saved and returned
+            mcq_payload = serialize_crew_output(result)
+            
+            # 🔥 EXTRACT AND LOG TOKEN USAGE
+            token_usage_info = extract_token_usage(result)
+            store_cached_mcq_result(cache_key, mcq_payload, token_usage_info)
         
-        # 🔥 EXTRACT AND LOG TOKEN USAGE
-        token_usage_info = extract_token_usage(result)
         if token_usage_info:
-            logger.info(f"🎯 SCRIPT {script_id} FINAL TOKEN USAGE: {token_usage_info}")
-            print(f"\n{'='*60}")
-            print(f"🔥 TOKEN USAGE SUMMARY FOR SCRIPT {script_id}")
-            print(f"{'='*60}")
-            if isinstance(token_usage_info, dict):
-                print(f"📊 Total Tokens: {token_usage_info.get('total_tokens', 'N/A')}")
-                print(f"📝 Prompt Tokens: {token_usage_info.get('prompt_tokens', 'N/A')}")
-                print(f"✨ Completion Tokens: {token_usage_info.get('completion_tokens', 'N/A')}")
-            else:
-                print(f"📊 Token Usage: {token_usage_info}")
-            print(f"{'='*60}\n")
+            logger.info("🎯 SCRIPT %s FINAL TOKEN USAGE: %s", script_id, token_usage_info)
+            if logger.isEnabledFor(logging.INFO):
+                print(f"\n{'='*60}")
+                print(f"🔥 TOKEN USAGE SUMMARY FOR SCRIPT {script_id}")
+                print(f"{'='*60}")
+                if isinstance(token_usage_info, dict):
+                    print(f"📊 Total Tokens: {token_usage_info.get('total_tokens', 'N/A')}")
+                    print(f"📝 Prompt Tokens: {token_usage_info.get('prompt_tokens', 'N/A')}")
+                    print(f"✨ Completion Tokens: {token_usage_info.get('completion_tokens', 'N/A')}")
+                else:
+                    print(f"📊 Token Usage: {token_usage_info}")
+                print(f"{'='*60}\n")
+        elif cache_hit:
+            logger.info("No tokens spent for script %s; the cached result originally used %s", script_id, cached_token_usage)
         else:
-            logger.warning(f"⚠️ No token usage information available for script {script_id}")
+            logger.warning("⚠️ No token usage information available for script %s", script_id)
         
         try:
-            existing_record = check_existing_compare_text(script_id)
-            
-            if existing_record:
-                compare_text_id = existing_record['compare_text_id']
-                db_result = update_existing_mcq_result(compare_text_id, result)
-                logger.info(f"Updated existing CompareText record {compare_text_id} with MCQ result")
-            else:
-                db_result = save_mcq_result(
-                    script_id=script_id,
-                    mcq_result=result,
-                    vlmdesc={"source": "MCQ processing", "pages": len(all_pages_ocr)},
-                    restructured={"processed": True, "total_pages": len(all_pages_ocr)},
-                    final_corrected_text=f"MCQ processing completed for {len(all_pages_ocr)} pages"
-                )
-                logger.info(f"Created new CompareText record with ID: {db_result.get('compare_text_id')}")
+            db_result = upsert_mcq_result(
+                script_id=script_id,
+                mcq_payload=mcq_payload,
+                vlmdesc={"source": "MCQ processing", "pages": len(all_pages_ocr)},
+                restructured={"processed": True, "total_pages": len(all_pages_ocr)},
+                final_corrected_text=f"MCQ processing completed for {len(all_pages_ocr)} pages"
+            )
+            logger.info("Saved MCQ result to CompareText record %s", db_result.get('compare_text_id'))
             
             return {
-                'mcq_result': serialize_crew_output(result),
+                'mcq_result': mcq_payload,
                 'token_usage': token_usage_info,  # Include token usage in response
+                'cached': cache_hit,
+                'cached_token_usage': cached_token_usage,
                 'database_saved': True,
                 'database_response': db_result
             }
             
         except Exception as db_error:
-            logger.warning(f"MCQ processing completed but failed to save to database: {db_error}")
+            logger.warning("MCQ processing completed but failed to save to database: %s", db_error)
             return {
-                'mcq_result': serialize_crew_output(result),
+                'mcq_result': mcq_payload,
                 'token_usage': token_usage_info,  # Include token usage in response
+                'cached': cache_hit,
+                'cached_token_usage': cached_token_usage,
                 'database_saved': False,
                 'database_error': str(db_error)
             }
@@ -320,34 +662,43 @@ def process_script_pages(script_data, script_id):
 # -------------------------------
 # 🧠 Core MCQ pipeline logic
 # -------------------------------
-def run_mcq_pipeline(script_id):
+def run_mcq_pipeline(script_id, refresh=False):
     """
     Run the MCQ OCR Processing crew for all pages of a specific script ID together.
+    refresh skips any cached crew output for the script's pages.
     """
     try:
-        logger.info(f"Fetching OCR data for script ID: {script_id}")
-        script_data = fetch_ocr_data(script_id=script_id)
+        logger.info("Fetching OCR data for script ID: %s", script_id)
+        # Build the crew while the OCR request is in flight
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ocr_future = executor.submit(fetch_ocr_data, script_id=script_id)
+            crew_future = executor.submit(build_mcq_crew)
+            script_data = ocr_future.result()
+            crew = crew_future.result()
         
         if not script_data:
             return False, f"No OCR data found for script ID: {script_id}"
         
-        logger.info(f"Found {len(script_data)} pages for script ID: {script_id}")
+        logger.info("Found %s pages for script ID: %s", len(script_data), script_id)
         
-        # Sort pages by page number to ensure correct order
-        script_data.sort(key=lambda x: x.get('page_number', 0))
+        # Sort pages by page number to ensure correct order (the API usually returns them sorted)
+        # Records without a page_number sort first, as page 0
+        page_keys = [record.get('page_number', 0) for record in script_data]
+        if any(current > following for current, following in zip(page_keys, page_keys[1:])):
+            script_data[:] = [record for _, record in sorted(zip(page_keys, script_data), key=itemgetter(0))]
         
         # Display page information
         page_numbers = [record.get('page_number', 'Unknown') for record in script_data]
-        logger.info(f"Processing pages: {page_numbers}")
+        logger.info("Processing pages: %s", page_numbers)
         
-        logger.info(f"⚡ STARTING MCQ PROCESSING for script {script_id} with {len(script_data)} pages...")
+        logger.info("⚡ STARTING MCQ PROCESSING for script %s with %s pages...", script_id, len(script_data))
         
         try:
-            result = process_script_pages(script_data, script_id)
+            result = process_script_pages(script_data, script_id, crew=crew, refresh=refresh)
             
             # 🔥 LOG FINAL TOKEN USAGE SUMMARY
             token_usage = result.get('token_usage')
-            if token_usage:
+            if token_usage and logger.isEnabledFor(logging.INFO):
                 print(f"\n🎉 MCQ PROCESSING COMPLETED SUCCESSFULLY!")
                 print(f"📋 Script ID: {script_id}")
                 print(f"📄 Total Pages Processed: {len(script_data)}")
@@ -364,21 +715,85 @@ def run_mcq_pipeline(script_id):
                 'result': result
             }
             
-            logger.info(f"✅ Successfully processed all pages for script ID: {script_id}")
+            logger.info("✅ Successfully processed all pages for script ID: %s", script_id)
             return True, final_result
             
         except Exception as e:
-            logger.error(f"Error processing script pages: {e}")
+            logger.error("Error processing script pages: %s", e)
             return False, f"Error processing script pages: {e}"
         
     except Exception as e:
-        logger.error(f"Error processing script ID {script_id}: {e}")
+        logger.error("Error processing script ID %s: %s", script_id, e)
         return False, f"Error processing script ID {script_id}: {e}"
 
+def build_pipeline_response(script_id, success, result):
+    """
+    Build the API response body and status code for a single pipeline run
+    """
+    if success:
+        # Extract token usage for API response
+        token_usage = None
+        if isinstance(result, dict) and 'result' in result:
+            token_usage = result['result'].get('token_usage')
+        
+        response_data = {
+            "status": "success",
+            "script_id": script_id,
+            "message": f"MCQ processing completed successfully for script {script_id}",
+            "data": result
+        }
+        
+        # Add token usage to response if available
+        if token_usage:
+            response_data["token_usage"] = token_usage
+        
+        return response_data, 200
+    else:
+        return {
+            "status": "error",
+            "script_id": script_id,
+            "message": result
+        }, 500
+
+def run_mcq_pipelines(script_ids, refresh=False):
+    """
+    Run the MCQ pipeline for several scripts concurrently, preserving input order
+    """
+    max_workers = max(1, min(len(script_ids), MAX_CONCURRENT_SCRIPTS))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda script_id: run_mcq_pipeline(script_id, refresh=refresh), script_ids))
+
 # -------------------------------
 # 🚀 Flask App
 # -------------------------------
-def run():
+def prewarm_django_connection():
+    """
+    Open a pooled keep-alive connection to the Django API so the first /run skips connection setup
+    """
+    # /health isn't a known Django route, so a 404 response is expected; the request only exists
+    # to open the socket. It deliberately avoids /ocr/, which without a script_id returns every record.
+    # Sent through a no-retry adapter sharing HTTP_ADAPTER's pool manager, so the socket lands in
+    # SESSION's pool but an unreachable server costs one 3s timeout rather than the retry schedule.
+    prewarm_adapter = HTTPAdapter(max_retries=0)
+    # Deliberately replaces the adapter's own PoolManager (never used) with SESSION's shared one
+    prewarm_adapter.poolmanager = HTTP_ADAPTER.poolmanager
+    try:
+        prepared = SESSION.prepare_request(requests.Request('GET', f"{DJANGO_API_BASE_URL}/health"))
+        # Same verify/cert/proxy settings as SESSION requests, so the connection lands in the same pool
+        settings = SESSION.merge_environment_settings(prepared.url, {}, None, None, None)
+        response = prewarm_adapter.send(prepared, timeout=3, **settings)
+        _ = response.content  # Drain the body so the connection goes back to the pool
+        response.close()
+    except requests.exceptions.RequestException as e:
+        logger.warning("Could not pre-warm connection to %s: %s", DJANGO_API_BASE_URL, e)
+
+def create_app():
+    """
+    Build the Flask app; used directly by Gunicorn as mcq.main:create_app()
+    """
+    # Runs in each Gunicorn worker, so every worker's pool starts with a warm socket
+    prewarm_django_connection()
+    
     app = Flask(__name__)
     app.secret_key = 'mcq_secret_key'
     
@@ -387,12 +802,13 @@ def run():
 
     @app.route('/')
     def index():
-        return jsonify({
+        return json_response({
             "message": "MCQ Processing API is running",
             "usage": "Access /run/<script_id> to process a script",
             "health_check": "/health",
             "endpoints": {
-                "process_script": "GET /run/<script_id>",
+                "process_script": "GET /run/<script_id>[?refresh=1]",
+                "process_scripts": "POST /run {\"script_id\": ...} or {\"script_ids\": [...]}, optional \"refresh\": true",
                 "health_check": "GET /health"
             }
         })
@@ -401,114 +817,128 @@ def run():
     def run_pipeline_route(script_id):
         """API endpoint to run MCQ pipeline with script_id"""
         if not script_id:
-            return jsonify({
+            return json_response({
                 "status": "error",
                 "message": "Script ID is required"
-            }), 400
+            }, 400)
         
-        logger.info(f"🎯 Processing MCQ pipeline for script_id: {script_id}")
-        success, result = run_mcq_pipeline(script_id)
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        logger.info("🎯 Processing MCQ pipeline for script_id: %s", script_id)
+        success, result = run_mcq_pipeline(script_id, refresh=refresh)
         
-        if success:
-            # Extract token usage for API response
-            token_usage = None
-            if isinstance(result, dict) and 'result' in result:
-                token_usage = result['result'].get('token_usage')
-            
-            response_data = {
-                "status": "success",
-                "script_id": script_id,
-                "message": f"MCQ processing completed successfully for script {script_id}",
-                "data": result
-            }
-            
-            # Add token usage to response if available
-            if token_usage:
-                response_data["token_usage"] = token_usage
-            
-            return jsonify(response_data), 200
-        else:
-            return jsonify({
-                "status": "error",
-                "script_id": script_id,
-                "message": result
-            }), 500
+        response_data, status_code = build_pipeline_response(script_id, success, result)
+        return json_response(response_data, status_code)
 
     @app.route('/run', methods=['POST'])
     def run_pipeline_post():
-        """API endpoint to run MCQ pipeline with JSON payload"""
+        """API endpoint to run MCQ pipeline with JSON payload (script_id or script_ids)"""
         try:
             data = request.get_json()
+            if data and 'script_ids' in data:
+                script_ids = data['script_ids']
+                if not isinstance(script_ids, list) or not script_ids:
+                    return json_response({
+                        "status": "error",
+                        "message": "script_ids must be a non-empty list"
+                    }, 400)
+                if not all(isinstance(script_id, int) and not isinstance(script_id, bool) for script_id in script_ids):
+                    return json_response({
+                        "status": "error",
+                        "message": "script_ids must contain only integers"
+                    }, 400)
+                
+                # Duplicate ids would run concurrent pipelines for the same script
+                script_ids = list(dict.fromkeys(script_ids))
+                if len(script_ids) > MAX_SCRIPTS_PER_REQUEST:
+                    return json_response({
+                        "status": "error",
+                        "message": f"At most {MAX_SCRIPTS_PER_REQUEST} script_ids can be processed per request"
+                    }, 400)
+                
+                logger.info("🎯 Processing MCQ pipeline for script_ids: %s", script_ids)
+                outcomes = run_mcq_pipelines(script_ids, refresh=bool(data.get('refresh')))
+                
+                results = [
+                    build_pipeline_response(script_id, success, result)[0]
+                    for script_id, (success, result) in zip(script_ids, outcomes)
+                ]
+                succeeded = sum(1 for success, _ in outcomes if success)
+                if succeeded == len(outcomes):
+                    status = "success"
+                elif succeeded:
+                    status = "partial"
+                else:
+                    status = "error"
+                
+                return json_response({
+                    "status": status,
+                    "message": f"MCQ processing completed for {succeeded} of {len(outcomes)} scripts",
+                    "results": results
+                }, 200 if succeeded else 500)
+            
             if not data or 'script_id' not in data:
-                return jsonify({
+                return json_response({
                     "status": "error",
-                    "message": "script_id is required in JSON payload"
-                }), 400
+                    "message": "script_id or script_ids is required in JSON payload"
+                }, 400)
             
             script_id = data['script_id']
-            logger.info(f"🎯 Processing MCQ pipeline for script_id: {script_id}")
-            success, result = run_mcq_pipeline(script_id)
+            logger.info("🎯 Processing MCQ pipeline for script_id: %s", script_id)
+            success, result = run_mcq_pipeline(script_id, refresh=bool(data.get('refresh')))
             
-            if success:
-                # Extract token usage for API response
-                token_usage = None
-                if isinstance(result, dict) and 'result' in result:
-                    token_usage = result['result'].get('token_usage')
-                
-                response_data = {
-                    "status": "success",
-                    "script_id": script_id,
-                    "message": f"MCQ processing completed successfully for script {script_id}",
-                    "data": result
-                }
-                
-                # Add token usage to response if available
-                if token_usage:
-                    response_data["token_usage"] = token_usage
-                
-                return jsonify(response_data), 200
-            else:
-                return jsonify({
-                    "status": "error",
-                    "script_id": script_id,
-                    "message": result
-                }), 500
+            response_data, status_code = build_pipeline_response(script_id, success, result)
+            return json_response(response_data, status_code)
                 
         except Exception as e:
-            logger.error(f"Error in POST endpoint: {e}")
-            return jsonify({
+            logger.error("Error in POST endpoint: %s", e)
+            return json_response({
                 "status": "error",
                 "message": f"Internal server error: {str(e)}"
-            }), 500
+            }, 500)
 
     # Health check endpoint to verify Django API connectivity
     @app.route('/health')
     def health_check():
         try:
-            response = requests.get(f"{DJANGO_API_BASE_URL}/ocr/", timeout=5)
+            response = SESSION.get(OCR_DATA_ENDPOINT, timeout=5)
             if response.status_code == 200:
-                return jsonify({
+                return json_response({
                     "status": "healthy", 
                     "django_api": "connected",
                     "endpoints_available": ["ocr", "compare-text"]
                 })
             else:
-                return jsonify({
+                return json_response({
                     "status": "unhealthy", 
                     "django_api": "error", 
                     "details": f"Status: {response.status_code}"
                 })
         except Exception as e:
-            return jsonify({
+            return json_response({
                 "status": "unhealthy", 
                 "django_api": "disconnected", 
                 "error": str(e)
             })
 
+    return app
+
+def run():
+    """
+    Start the API under Gunicorn with gevent workers and HTTP keep-alive
+    """
     # Get port from environment variable or default to 5002
     port = int(os.environ.get('PORT', 5002))
-    logger.info(f"Starting MCQ API server on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    workers = int(os.environ.get('WEB_CONCURRENCY', 2 * (os.cpu_count() or 1) + 1))
+    logger.info("Starting MCQ API server on port %s with %s workers", port, workers)
+    # gevent workers patch blocking I/O before loading the app, so Django and LLM calls yield
+    os.execvp('gunicorn', [
+        'gunicorn',
+        '-k', 'gevent',
+        '-w', str(workers),
+        '--keep-alive', '30',
+        '-b', f'0.0.0.0:{port}',
+        'mcq.main:create_app()'
+    ])
 
 # -------------------------------
 # 🧭 Main entry